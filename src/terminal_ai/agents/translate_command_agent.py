@@ -4,18 +4,51 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass
+import string
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, Sequence
 
+from terminal_ai.io import _json
 from terminal_ai.io.language_model_client import LanguageModelClient
 
-_DESTRUCTIVE_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"rm\s+-rf\b"),
-    re.compile(r"rm\s+-fr\b"),
-    re.compile(r"mkfs\b"),
-    re.compile(r"dd\s+if=", re.IGNORECASE),
-    re.compile(r"shutdown\b"),
-    re.compile(r"reboot\b"),
+_DANGER_COMMANDS = frozenset({"mkfs", "shutdown", "reboot", "poweroff", "halt"})
+_COMMAND_WRAPPERS = frozenset(
+    {
+        "sudo",
+        "doas",
+        "env",
+        "nohup",
+        "nice",
+        "time",
+        "timeout",
+        "command",
+        "exec",
+        "xargs",
+    }
+)
+# Wrapper options that consume the next word, and leading positionals to skip.
+_WRAPPER_OPTION_VALUES: dict[str, frozenset[str]] = {
+    "sudo": frozenset({"-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-U"}),
+    "doas": frozenset({"-u", "-C"}),
+    "env": frozenset({"-u", "-C", "-S"}),
+    "nice": frozenset({"-n"}),
+    "timeout": frozenset({"-s", "-k"}),
+    "xargs": frozenset({"-a", "-d", "-E", "-I", "-L", "-n", "-P", "-s"}),
+}
+_WRAPPER_POSITIONALS = {"timeout": 1}
+_SEGMENT_SEPARATORS = str.maketrans(dict.fromkeys(";&|(){}`\n", "\n"))
+# The original substring patterns, merged; they also catch commands passed as
+# arguments (``find -exec rm -rf``, ``bash -c '...'``, ``ssh host reboot``).
+_DESTRUCTIVE_PATTERN = re.compile(
+    r"rm\s+-rf\b|rm\s+-fr\b|mkfs\b|(?i:dd\s+if=)|shutdown\b|reboot\b"
+)
+
+_JSON_DECODER = json.JSONDecoder()
+
+_STREAMED_FIELDS: tuple[tuple[str, re.Pattern[str]], ...] = tuple(
+    (name, re.compile(rf'"{name}"\s*:\s*("(?:[^"\\]|\\.)*")'))
+    for name in ("command", "explanation")
 )
 
 
@@ -28,6 +61,11 @@ class CommandRequest:
     shell: str = "/bin/bash"
     temperature: float = 0.0
     allow_destructive: bool = False
+    cwd_str: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Rendered into every prompt; computed once rather than per suggestion.
+        self.cwd_str = str(self.cwd) if self.cwd else "~"
 
 
 @dataclass(slots=True)
@@ -62,25 +100,138 @@ class TranslateCommandAgent:
         system_prompt_template: str,
     ) -> None:
         self._model_client = model_client
-        self._system_prompt_template = system_prompt_template
+        self._render_prompt = _compile_prompt_template(system_prompt_template)
 
     def suggest(self, request: CommandRequest) -> CommandSuggestion:
-        system_prompt = self._system_prompt_template.format(
-            shell=request.shell,
-            cwd=(str(request.cwd) if request.cwd else "~"),
-        )
+        system_prompt, user_prompt = self._build_prompts(request)
         raw_response = self._model_client.complete(
             system_prompt=system_prompt,
-            user_prompt=request.instruction.strip(),
+            user_prompt=user_prompt,
             temperature=request.temperature,
         )
-        suggestion = self._parse_response(raw_response)
+        return self._finalize(raw_response, request)
+
+    def suggest_stream(
+        self,
+        request: CommandRequest,
+        on_field: Callable[[str, str], None],
+    ) -> CommandSuggestion:
+        """Like :meth:`suggest`, reporting fields as soon as they are streamed.
+
+        ``on_field`` receives ``("command", value)`` and ``("explanation", value)``
+        the moment each JSON string closes; the full suggestion is returned once
+        the response completes. Clients without ``complete_stream`` are called
+        through ``complete`` instead.
+        """
+
+        system_prompt, user_prompt = self._build_prompts(request)
+        stream = getattr(self._model_client, "complete_stream", None)
+        if stream is None:
+            chunks = iter(
+                (
+                    self._model_client.complete(
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                        temperature=request.temperature,
+                    ),
+                )
+            )
+        else:
+            chunks = stream(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=request.temperature,
+            )
+
+        buffer = ""
+        pending = list(_STREAMED_FIELDS)
+        for chunk in chunks:
+            buffer += chunk
+            for name, pattern in tuple(pending):
+                match = pattern.search(buffer)
+                if match is None:
+                    continue
+                pending.remove((name, pattern))
+                try:
+                    value = _json.loads(match.group(1))
+                except _json.JSONDecodeError:
+                    continue
+                on_field(name, str(value).strip())
+        return self._finalize(buffer, request)
+
+    def suggest_many(
+        self,
+        requests: Sequence[CommandRequest],
+        *,
+        max_concurrency: int = 10,
+    ) -> list[CommandSuggestion | Exception]:
+        """Return suggestions for ``requests`` in order, issuing them concurrently.
+
+        Uses the client's ``complete_many`` when available and falls back to
+        sequential ``complete`` calls otherwise. Per-request failures are returned
+        in place of the suggestion.
+        """
+
+        if not requests:
+            return []
+        temperatures = {request.temperature for request in requests}
+        if len(temperatures) > 1:
+            raise ValueError("All batched requests must share the same temperature")
+        temperature = temperatures.pop()
+
+        prompts = [self._build_prompts(request) for request in requests]
+        complete_many = getattr(self._model_client, "complete_many", None)
+        if complete_many is not None:
+            import asyncio
+
+            responses = asyncio.run(
+                complete_many(
+                    prompts,
+                    temperature=temperature,
+                    max_concurrency=max_concurrency,
+                )
+            )
+        else:
+            responses = []
+            for system_prompt, user_prompt in prompts:
+                try:
+                    responses.append(
+                        self._model_client.complete(
+                            system_prompt=system_prompt,
+                            user_prompt=user_prompt,
+                            temperature=temperature,
+                        )
+                    )
+                except Exception as exc:
+                    responses.append(exc)
+
+        results: list[CommandSuggestion | Exception] = []
+        for request, response in zip(requests, responses):
+            if isinstance(response, BaseException):
+                if not isinstance(response, Exception):
+                    raise response
+                results.append(response)
+                continue
+            try:
+                results.append(self._finalize(response, request))
+            except CommandParsingError as exc:
+                results.append(exc)
+        return results
+
+    def _build_prompts(self, request: CommandRequest) -> tuple[str, str]:
+        system_prompt = self._render_prompt(request.shell, request.cwd_str)
+        return system_prompt, request.instruction.strip()
+
+    def _finalize(self, raw_response: str, request: CommandRequest) -> CommandSuggestion:
+        suggestion = self.parse_response(raw_response)
         if suggestion.command and not request.allow_destructive:
             suggestion = self._enforce_confirmation(suggestion)
         return suggestion
 
     @staticmethod
-    def _parse_response(response_text: str) -> CommandSuggestion:
+    def parse_response(response_text: str) -> CommandSuggestion:
+        """Parse a raw model reply, raising :class:`CommandParsingError` if unusable."""
+
         try:
             payload = _extract_json_object(response_text)
         except ValueError as exc:  # pragma: no cover - defensive path
@@ -103,23 +254,110 @@ class TranslateCommandAgent:
 
     @staticmethod
     def _enforce_confirmation(suggestion: CommandSuggestion) -> CommandSuggestion:
-        if any(pattern.search(suggestion.command) for pattern in _DESTRUCTIVE_PATTERNS):
+        if _is_destructive(suggestion.command):
             return suggestion.with_confirmation(True)
         return suggestion
 
 
+def _is_destructive(command: str) -> bool:
+    """Return whether any simple command in ``command`` looks destructive.
+
+    Anything the substring patterns match is flagged. Otherwise the command is
+    cut at shell separators and each piece is checked by its first word, after
+    peeling wrappers such as ``sudo`` and ``VAR=value``.
+    """
+
+    if _DESTRUCTIVE_PATTERN.search(command):
+        return True
+    for segment in command.translate(_SEGMENT_SEPARATORS).split("\n"):
+        argv = segment.split()
+        index = 0
+        wrapper = ""
+        positionals = 0
+        while index < len(argv):
+            token = argv[index]
+            if token in _COMMAND_WRAPPERS:
+                wrapper, positionals = token, _WRAPPER_POSITIONALS.get(token, 0)
+            elif token.startswith("-"):
+                if token in _WRAPPER_OPTION_VALUES.get(wrapper, ()):
+                    index += 1
+            elif "=" in token:
+                pass
+            elif positionals:
+                positionals -= 1
+            else:
+                break
+            index += 1
+        if index >= len(argv):
+            continue
+
+        name = argv[index].rpartition("/")[2]
+        args = argv[index + 1 :]
+        if name in _DANGER_COMMANDS or name.startswith("mkfs."):
+            return True
+        if name == "rm" and any(_is_recursive_flag(arg) for arg in args):
+            return True
+        if name == "dd" and any(arg.startswith("if=") for arg in args):
+            return True
+    return False
+
+
+def _is_recursive_flag(arg: str) -> bool:
+    if arg.startswith("--"):
+        return arg == "--recursive"
+    return arg.startswith("-") and ("r" in arg or "R" in arg)
+
+
+def _compile_prompt_template(template: str) -> Callable[[str, str], str]:
+    """Return ``render(shell, cwd)`` equivalent to ``template.format(shell=, cwd=)``.
+
+    The template is parsed once; rendering only joins the literal chunks with the
+    two values. Templates using other fields, conversions or format specs keep
+    going through ``str.format`` so errors surface exactly as before.
+    """
+
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        parsed = None
+    if parsed is None or any(
+        name not in (None, "shell", "cwd") or spec or conversion
+        for _, name, spec, conversion in parsed
+    ):
+        return lambda shell, cwd: template.format(shell=shell, cwd=cwd)
+
+    parts = tuple((literal, name) for literal, name, _, _ in parsed)
+
+    def render(shell: str, cwd: str) -> str:
+        return "".join(
+            [
+                literal + (shell if name == "shell" else cwd) if name else literal
+                for literal, name in parts
+            ]
+        )
+
+    return render
+
+
 def _extract_json_object(response_text: str) -> dict[str, object]:
     """Return the first JSON object found in the response text."""
 
+    try:
+        payload = _json.loads(response_text)
+    except _json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(payload, dict):
+            return payload
+
     start = response_text.find("{")
-    end = response_text.rfind("}")
-    if start == -1 or end == -1 or end <= start:
+    if start == -1:
         raise ValueError("Response did not contain JSON object")
-    candidate = response_text[start : end + 1]
     try:
-        return json.loads(candidate)
+        payload, _ = _JSON_DECODER.raw_decode(response_text, start)
     except json.JSONDecodeError as exc:
         raise ValueError(f"Unable to decode JSON: {exc}") from exc
+    return payload
 
 
 __all__ = [
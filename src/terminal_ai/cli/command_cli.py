@@ -2,80 +2,185 @@
 
 from __future__ import annotations
 
-import argparse
 import os
 import sys
-from pathlib import Path
-from textwrap import dedent
-from typing import Sequence
-
-from terminal_ai.agents.translate_command_agent import (
-    CommandParsingError,
-    CommandRequest,
-    TranslateCommandAgent,
-)
-from terminal_ai.io.command_runner import CommandRunner
-from terminal_ai.io.language_model_client import OpenAIChatClient
-from terminal_ai.io.prompt_loader import load_prompt
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Sequence, TextIO
+
+if TYPE_CHECKING:
+    import argparse
+    from pathlib import Path
+
+    from terminal_ai.io.language_model_client import LanguageModelClient
 
 _DEFAULT_PROMPT = "command_synthesis.txt"
 _DEFAULT_MODEL = os.getenv("TERMINAL_AI_MODEL", "gpt-4o-mini")
+_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+_DEFAULT_SHELL = "/bin/bash"
+
+# Options understood by the fast parser; must stay in sync with _build_parser.
+_VALUE_OPTIONS: dict[str, tuple[str, Callable[[str], object]]] = {
+    "--prompt": ("prompt", str),
+    "--model": ("model", str),
+    "--api-key": ("api_key", str),
+    "--base-url": ("base_url", str),
+    "--shell": ("shell", str),
+    "--cwd": ("cwd", str),
+    "--temperature": ("temperature", float),
+    "--batch": ("batch", str),
+    "--batch-id": ("batch_id", str),
+}
+_SWITCH_OPTIONS: dict[str, str] = {
+    "--dry-run": "dry_run",
+    "--accept": "accept",
+    "--no-exec": "no_exec",
+    "--allow-destructive": "allow_destructive",
+    "--no-cache": "no_cache",
+    "--clear-cache": "clear_cache",
+    "--daemon": "daemon",
+}
+
+# Kept flush-left so no dedent() is needed at import time.
+_EMBEDDED_PROMPT = """\
+You are TerminalAI, an expert macOS and Linux shell assistant. Convert the provided
+user request into a single shell command that can be executed from an interactive
+terminal session.
+
+Constraints:
+- Assume the default shell is {shell} unless specified otherwise.
+- Assume the current working directory is {cwd}.
+- Prefer concise commands that rely on standard tooling already available.
+- If the request is ambiguous, add a clarifying question in the `follow_up` field.
+- Respect safety: never include commands that permanently delete data, reformat
+  disks, or escalate privileges unless explicitly requested.
+- Output MUST be valid JSON matching this schema:
+  {{
+    "command": "...",            # string; leave empty when no safe command exists
+    "explanation": "...",       # short justification for the command
+    "requires_confirmation": bool,
+    "follow_up": "..."          # optional; empty string when nothing to clarify
+  }}
+- Keep the explanation under 160 characters.
 
-_EMBEDDED_PROMPT = dedent(
-    """\
-    You are TerminalAI, an expert macOS and Linux shell assistant. Convert the provided
-    user request into a single shell command that can be executed from an interactive
-    terminal session.
-
-    Constraints:
-    - Assume the default shell is {shell} unless specified otherwise.
-    - Assume the current working directory is {cwd}.
-    - Prefer concise commands that rely on standard tooling already available.
-    - If the request is ambiguous, add a clarifying question in the `follow_up` field.
-    - Respect safety: never include commands that permanently delete data, reformat
-      disks, or escalate privileges unless explicitly requested.
-    - Output MUST be valid JSON matching this schema:
-      {{
-        "command": "...",            # string; leave empty when no safe command exists
-        "explanation": "...",       # short justification for the command
-        "requires_confirmation": bool,
-        "follow_up": "..."          # optional; empty string when nothing to clarify
-      }}
-    - Keep the explanation under 160 characters.
-
-    Render the JSON directly with no surrounding markdown. Fill in all fields.
+Render the JSON directly with no surrounding markdown. Fill in all fields.
+"""
+
+
+def main(
+    argv: Sequence[str] | None = None,
+    *,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+    stdin: TextIO | None = None,
+    handoff: Callable[[dict[str, object]], int] | None = None,
+    clients: dict[tuple[str, str, str, bool], LanguageModelClient] | None = None,
+) -> int:
+    """Run the CLI, writing to ``stdout``/``stderr`` (default: the process streams).
+
+    When explicit streams are given, executed commands have their output captured
+    into them instead of inheriting the terminal. The daemon passes ``handoff``,
+    which receives the suggested command as :func:`run_command` keyword arguments
+    instead of it being confirmed and run here, and ``clients``, which keeps model
+    clients (and their connections) alive across calls.
     """
-)
 
+    out = stdout or sys.stdout
+    err = stderr or sys.stderr
+    args = _parse_argv(sys.argv[1:] if argv is None else argv)
+    if args is None:
+        args = _build_parser().parse_args(argv)
 
-def main(argv: Sequence[str] | None = None) -> int:
-    parser = _build_parser()
-    args = parser.parse_args(argv)
+    if stdout is not None or stderr is not None:
+        # Captured runs (the daemon) cannot block for hours or stream a batch id.
+        for option, requested in (("--daemon", args.daemon), ("--batch", args.batch)):
+            if requested:
+                print(f"{option} cannot be requested through the daemon.", file=err)
+                return 1
 
-    instruction = " ".join(args.instruction).strip()
-    if not instruction:
+    if args.daemon:
+        from terminal_ai.cli.daemon import serve
+
+        return serve()
+
+    # Runtime modules are imported only once arguments parse, keeping --help and
+    # usage errors fast.
+    if args.clear_cache:
+        from terminal_ai.io.llm_cache import clear_cache
+
+        for client in (clients or {}).values():
+            # Drop open cache connections; they reconnect to a fresh database.
+            close = getattr(client, "close", None)
+            if close is not None:
+                close()
         try:
-            instruction = input("Describe the task> ").strip()
-        except EOFError:
-            instruction = ""
-    if not instruction:
-        print("No instruction provided.", file=sys.stderr)
+            clear_cache()
+        except OSError as exc:
+            print(f"Failed to clear response cache: {exc}", file=err)
+            return 1
+        if not args.instruction and not args.batch:
+            print("Response cache cleared.", file=out)
+            return 0
+
+    instruction = " ".join(args.instruction).strip()
+    if args.batch_id and not args.batch:
+        print("--batch-id requires the --batch FILE that was submitted.", file=err)
         return 1
+    if args.batch:
+        if instruction:
+            print("Pass instructions either inline or via --batch, not both.", file=err)
+            return 1
+    else:
+        if not instruction:
+            try:
+                instruction = _ask("Describe the task> ", out, stdin).strip()
+            except EOFError:
+                instruction = ""
+        if not instruction:
+            print("No instruction provided.", file=err)
+            return 1
+
+    from pathlib import Path
+
+    from terminal_ai.agents.translate_command_agent import (
+        CommandParsingError,
+        CommandRequest,
+        TranslateCommandAgent,
+    )
+    from terminal_ai.io.language_model_client import OpenAIChatClient
+    from terminal_ai.io.llm_cache import CachingLanguageModelClient
+    from terminal_ai.io.prompt_loader import load_prompt
 
     try:
         prompt_template = load_prompt(args.prompt)
     except FileNotFoundError as exc:
         if args.prompt != _DEFAULT_PROMPT:
-            print(f"{exc}", file=sys.stderr)
+            print(f"{exc}", file=err)
             return 1
         prompt_template = _EMBEDDED_PROMPT
 
     api_key = args.api_key or os.getenv("OPENAI_API_KEY")
     if not api_key:
-        print("Missing OpenAI API key. Set OPENAI_API_KEY or pass --api-key.", file=sys.stderr)
+        print("Missing OpenAI API key. Set OPENAI_API_KEY or pass --api-key.", file=err)
         return 1
 
-    client = OpenAIChatClient(model=args.model, api_key=api_key, base_url=args.base_url)
+    if args.batch:
+        return _run_batch(
+            args, prompt_template=prompt_template, api_key=api_key, out=out, err=err
+        )
+
+    client_key = (args.model, api_key, args.base_url, not args.no_cache)
+    client = (clients or {}).get(client_key)
+    if client is None:
+        client = OpenAIChatClient(model=args.model, api_key=api_key, base_url=args.base_url)
+        if not args.no_cache:
+            client = CachingLanguageModelClient(
+                client,
+                model=args.model,
+                base_url=args.base_url,
+                validate=TranslateCommandAgent.parse_response,
+            )
+        if clients is not None:
+            clients[client_key] = client
     agent = TranslateCommandAgent(model_client=client, system_prompt_template=prompt_template)
 
     cwd = Path(args.cwd).expanduser().resolve() if args.cwd else Path.cwd()
@@ -87,56 +192,253 @@ def main(argv: Sequence[str] | None = None) -> int:
         allow_destructive=args.allow_destructive,
     )
 
+    printed: dict[str, str] = {}
+
+    def _print_field(name: str, value: str) -> None:
+        if not value:
+            return
+        if name == "command":
+            print(f"Command: {value}", file=out, flush=True)
+        elif name == "explanation" and "command" in printed:
+            print(f"Why: {value}", file=out, flush=True)
+        else:
+            return
+        printed[name] = value
+
     try:
-        suggestion = agent.suggest(request)
+        suggestion = agent.suggest_stream(request, _print_field)
     except CommandParsingError as exc:
-        print(f"Failed to parse model response: {exc}", file=sys.stderr)
+        print(f"Failed to parse model response: {exc}", file=err)
         return 2
     except Exception as exc:  # pragma: no cover - defensive guard for HTTP errors
-        print(f"Model request failed: {exc}", file=sys.stderr)
+        print(f"Model request failed: {exc}", file=err)
         return 3
 
     if suggestion.follow_up and not suggestion.command:
-        print(f"Follow-up needed: {suggestion.follow_up}")
+        print(f"Follow-up needed: {suggestion.follow_up}", file=out)
         return 10
 
-    print(f"Command: {suggestion.command}")
-    if suggestion.explanation:
-        print(f"Why: {suggestion.explanation}")
+    # Streamed fields come from the first match in the response, while the parsed
+    # suggestion keeps the last value of a repeated key; show what will really run.
+    if printed.get("command") != suggestion.command:
+        if "command" in printed:
+            print("The final response has a different command:", file=err)
+            suggestion = suggestion.with_confirmation(True)
+        print(f"Command: {suggestion.command}", file=out)
+    if suggestion.explanation and printed.get("explanation") != suggestion.explanation:
+        print(f"Why: {suggestion.explanation}", file=out)
 
     if args.no_exec:
         return 0
 
-    should_execute = args.accept or not suggestion.requires_confirmation
-    if not should_execute:
+    command: dict[str, object] = {
+        "command": suggestion.command,
+        "requires_confirmation": suggestion.requires_confirmation and not args.accept,
+        "cwd": str(cwd),
+        "shell": args.shell,
+        "dry_run": args.dry_run,
+    }
+    if handoff is not None:
+        return handoff(command)
+    return run_command(**command, stdout=stdout, stderr=stderr, stdin=stdin)
+
+
+def run_command(
+    command: str,
+    *,
+    requires_confirmation: bool,
+    cwd: str | Path,
+    shell: str = _DEFAULT_SHELL,
+    dry_run: bool = False,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+    stdin: TextIO | None = None,
+) -> int:
+    """Ask before running ``command`` if required, then run it; return its exit code."""
+
+    from pathlib import Path
+
+    from terminal_ai.io.command_runner import CommandRunner
+
+    out = stdout or sys.stdout
+    if requires_confirmation:
         try:
-            answer = input("Execute command? [y/N]: ").strip().lower()
+            answer = _ask("Execute command? [y/N]: ", out, stdin).strip().lower()
         except EOFError:
             answer = ""
-        should_execute = answer in {"y", "yes"}
+        if answer not in {"y", "yes"}:
+            print("Aborted.", file=out)
+            return 0
 
-    if not should_execute:
-        print("Aborted.")
-        return 0
-
-    runner = CommandRunner(shell=args.shell, dry_run=args.dry_run)
-    result = runner.execute(suggestion.command, cwd=cwd)
+    runner = CommandRunner(shell=shell, dry_run=dry_run)
+    if stdout is None and stderr is None:
+        result = runner.execute(command, cwd=Path(cwd), stream=True, capture=False)
+        return result.returncode
 
-    if result.stdout:
-        print(result.stdout, end="")
-    if result.stderr:
-        print(result.stderr, end="", file=sys.stderr)
+    result = runner.execute(command, cwd=Path(cwd))
+    out.write(result.stdout)
+    (stderr or sys.stderr).write(result.stderr)
     return result.returncode
 
 
+def _run_batch(
+    args: argparse.Namespace | SimpleNamespace,
+    *,
+    prompt_template: str,
+    api_key: str,
+    out: TextIO,
+    err: TextIO,
+) -> int:
+    """Suggest commands for every line of ``args.batch`` via the Batch API."""
+
+    from pathlib import Path
+
+    from terminal_ai.agents.translate_command_agent import (
+        CommandRequest,
+        TranslateCommandAgent,
+    )
+    from terminal_ai.io.language_model_client import BatchOpenAIChatClient
+
+    try:
+        lines = Path(args.batch).read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        print(f"Failed to read batch file: {exc}", file=err)
+        return 1
+    instructions = [line.strip() for line in lines if line.strip()]
+    if not instructions:
+        print(f"No instructions found in {args.batch}.", file=err)
+        return 1
+
+    def _report_batch(batch_id: str) -> None:
+        print(
+            f"Submitted batch {batch_id}; if interrupted, resume with "
+            f"--batch {args.batch} --batch-id {batch_id}",
+            file=err,
+            flush=True,
+        )
+
+    client = BatchOpenAIChatClient(
+        model=args.model,
+        api_key=api_key,
+        base_url=args.base_url,
+        batch_id=args.batch_id,
+        on_submit=_report_batch,
+    )
+    agent = TranslateCommandAgent(model_client=client, system_prompt_template=prompt_template)
+    cwd = Path(args.cwd).expanduser().resolve() if args.cwd else Path.cwd()
+    requests = [
+        CommandRequest(
+            instruction=instruction,
+            cwd=cwd,
+            shell=args.shell,
+            temperature=args.temperature,
+            allow_destructive=args.allow_destructive,
+        )
+        for instruction in instructions
+    ]
+
+    try:
+        results = agent.suggest_many(requests)
+    except Exception as exc:  # pragma: no cover - defensive guard for HTTP errors
+        print(f"Model request failed: {exc}", file=err)
+        return 3
+
+    exit_code = 0
+    for instruction, result in zip(instructions, results):
+        print(f"# {instruction}", file=out)
+        if isinstance(result, Exception):
+            print(f"Failed: {result}", file=err)
+            exit_code = 2
+        elif result.follow_up and not result.command:
+            print(f"Follow-up needed: {result.follow_up}", file=out)
+        else:
+            print(f"Command: {result.command}", file=out)
+            if result.explanation:
+                print(f"Why: {result.explanation}", file=out)
+    return exit_code
+
+
+def _ask(question: str, out: TextIO, stdin: TextIO | None) -> str:
+    """Prompt like :func:`input`, reading from ``stdin`` when one is supplied."""
+
+    if stdin is None:
+        return input(question)
+    out.write(question)
+    out.flush()
+    line = stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def _parse_argv(argv: Sequence[str]) -> SimpleNamespace | None:
+    """Parse the common argv shapes without building an argparse parser.
+
+    Returns ``None`` for anything unusual (``--help``, unknown or abbreviated
+    options, missing or invalid values, split positionals) so the caller can
+    defer to argparse for its exact behaviour and error messages.
+    """
+
+    values: dict[str, object] = {
+        "prompt": _DEFAULT_PROMPT,
+        "model": _DEFAULT_MODEL,
+        "api_key": None,
+        "base_url": _DEFAULT_BASE_URL,
+        "shell": _DEFAULT_SHELL,
+        "cwd": None,
+        "temperature": 0.0,
+        "batch": None,
+        "batch_id": None,
+    }
+    values.update(dict.fromkeys(_SWITCH_OPTIONS.values(), False))
+    instruction: list[str] = []
+    positional_run_ended = False
+
+    index = 0
+    while index < len(argv):
+        token = argv[index]
+        index += 1
+        if not token.startswith("-") or token == "-":
+            # argparse only fills ``instruction`` from one contiguous run.
+            if positional_run_ended:
+                return None
+            instruction.append(token)
+            continue
+        if instruction:
+            positional_run_ended = True
+
+        name, has_inline, inline_value = token.partition("=")
+        if name in _SWITCH_OPTIONS and not has_inline:
+            values[_SWITCH_OPTIONS[name]] = True
+            continue
+        if name not in _VALUE_OPTIONS:
+            return None
+        if has_inline:
+            raw_value = inline_value
+        elif index < len(argv) and not argv[index].startswith("-"):
+            raw_value = argv[index]
+            index += 1
+        else:
+            return None
+        dest, convert = _VALUE_OPTIONS[name]
+        try:
+            values[dest] = convert(raw_value)
+        except ValueError:
+            return None
+
+    return SimpleNamespace(instruction=instruction, **values)
+
+
 def _build_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("instruction", nargs="*", help="Natural language description of the task")
     parser.add_argument("--prompt", default=_DEFAULT_PROMPT, help="Prompt template filename inside prompts/")
     parser.add_argument("--model", default=_DEFAULT_MODEL, help="Model name for the OpenAI Chat API")
     parser.add_argument("--api-key", dest="api_key", help="Override OPENAI_API_KEY environment variable")
-    parser.add_argument("--base-url", default="https://api.openai.com/v1", help="Override OpenAI API base URL")
-    parser.add_argument("--shell", default="/bin/bash", help="Shell executable used for command execution")
+    parser.add_argument("--base-url", default=_DEFAULT_BASE_URL, help="Override OpenAI API base URL")
+    parser.add_argument("--shell", default=_DEFAULT_SHELL, help="Shell executable used for command execution")
     parser.add_argument("--cwd", help="Working directory for executing commands")
     parser.add_argument("--temperature", type=float, default=0.0, help="Sampling temperature for the model")
     parser.add_argument("--dry-run", action="store_true", help="Print the command but do not execute it")
@@ -155,7 +457,32 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Allow potentially destructive commands without forcing confirmation",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the model instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete cached model responses before running",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Serve requests from `python -m terminal_ai.cli.daemon` over a Unix socket",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Suggest commands for each line of FILE via the OpenAI Batch API (no execution)",
+    )
+    parser.add_argument(
+        "--batch-id",
+        metavar="ID",
+        help="Collect the results of a batch already submitted for the same --batch FILE",
+    )
     return parser
 
 
-__all__ = ["main"]
+__all__ = ["main", "run_command"]
@@ -0,0 +1,203 @@
+"""Warm-start daemon serving CLI invocations over a Unix socket.
+
+``python -m terminal_ai.cli --daemon`` keeps an interpreter with the runtime
+modules imported and one model client per configuration connected, and answers
+requests from ``python -m terminal_ai.cli.daemon``, a thin client that skips
+those imports. Each request is one JSON line ``{"argv": [...], "cwd": "..."}``
+answered by ``{"stdout", "stderr", "code", "command"}``.
+
+The daemon only produces the suggestion. ``command`` holds the suggested command
+as :func:`~terminal_ai.cli.command_cli.run_command` arguments, and the client
+confirms and runs it in its own terminal and environment. The daemon's
+environment (API key, model) still applies to the model request.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from terminal_ai.io.language_model_client import LanguageModelClient
+
+_ENV_VAR = "TERMINAL_AI_DAEMON_SOCKET"
+_CACHE_ENV_VAR = "TERMINAL_AI_CACHE_DIR"
+_CLIENT_ONLY_OPTIONS = frozenset({"--batch", "--batch-id"})
+
+# (model, API key, base URL, cached) -> client kept for the daemon's lifetime.
+_ClientKey = tuple[str, str, str, bool]
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path, honouring ``TERMINAL_AI_DAEMON_SOCKET``."""
+
+    env_override = os.getenv(_ENV_VAR)
+    if env_override:
+        return Path(env_override).expanduser()
+    cache_dir = os.getenv(_CACHE_ENV_VAR)
+    directory = (
+        Path(cache_dir).expanduser() if cache_dir else Path.home() / ".cache" / "terminal_ai"
+    )
+    return directory / "daemon.sock"
+
+
+def serve(path: Path | None = None) -> int:
+    """Serve CLI requests sequentially until interrupted."""
+
+    # Import the runtime up front so requests never pay for it.
+    import terminal_ai.agents.translate_command_agent  # noqa: F401
+    import terminal_ai.io  # noqa: F401
+
+    path = path or socket_path()
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+
+    clients: dict[_ClientKey, LanguageModelClient] = {}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        previous_umask = os.umask(0o177)
+        try:
+            server.bind(str(path))
+        finally:
+            os.umask(previous_umask)
+        server.listen()
+        signal.signal(signal.SIGTERM, _interrupt)
+        print(f"terminal-ai daemon listening on {path}", file=sys.stderr)
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    _handle(conn, clients)
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def request(argv: Sequence[str], *, path: Path | None = None) -> int:
+    """Run ``argv`` through the daemon, replay its output and run its command here.
+
+    Returns the exit code of the CLI, or of the command when one was suggested.
+
+    Raises ``FileNotFoundError`` or ``ConnectionRefusedError`` when no daemon is
+    listening.
+    """
+
+    return _request(_connect(path), argv)
+
+
+def client_main(argv: Sequence[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    from terminal_ai.cli.command_cli import main
+
+    if any(arg.partition("=")[0] in _CLIENT_ONLY_OPTIONS for arg in argv):
+        # Batch runs poll for hours and must show their id right away.
+        return main(argv)
+    try:
+        client = _connect(None)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No daemon listening; nothing was sent, so run in-process instead.
+        return main(argv)
+    return _request(client, argv)
+
+
+def _connect(path: Path | None) -> socket.socket:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path or socket_path()))
+    except BaseException:
+        client.close()
+        raise
+    return client
+
+
+def _request(client: socket.socket, argv: Sequence[str]) -> int:
+    payload = json.dumps({"argv": list(argv), "cwd": os.getcwd()}).encode("utf-8")
+    with client:
+        client.sendall(payload + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        response = json.loads(_read_all(client))
+
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    command = response.get("command")
+    if not command:
+        return int(response["code"])
+
+    from terminal_ai.cli.command_cli import run_command
+
+    return run_command(**command)
+
+
+def _handle(conn: socket.socket, clients: dict[_ClientKey, LanguageModelClient]) -> None:
+    import contextlib
+    import io
+
+    from terminal_ai.cli.command_cli import main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    handed_off: list[dict[str, object]] = []
+
+    def _handoff(command: dict[str, object]) -> int:
+        handed_off.append(command)
+        return 0
+
+    try:
+        message = json.loads(_read_all(conn))
+        argv = [str(arg) for arg in message["argv"]]
+        cwd = str(message.get("cwd") or os.getcwd())
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        code = 1
+        stderr.write(f"Invalid daemon request: {exc}\n")
+    else:
+        previous_cwd = os.getcwd()
+        try:
+            os.chdir(cwd)
+            # argparse writes --help and usage errors to the process streams.
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                code = main(
+                    argv,
+                    stdout=stdout,
+                    stderr=stderr,
+                    stdin=io.StringIO(),
+                    handoff=_handoff,
+                    clients=clients,
+                )
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+        except Exception as exc:  # pragma: no cover - keep serving other requests
+            code = 1
+            stderr.write(f"terminal-ai daemon error: {exc}\n")
+        finally:
+            os.chdir(previous_cwd)
+
+    response = {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "code": code,
+        "command": handed_off[0] if handed_off else None,
+    }
+    try:
+        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+    except OSError:
+        pass
+
+
+def _interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def _read_all(conn: socket.socket) -> bytes:
+    chunks = []
+    while chunk := conn.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+if __name__ == "__main__":
+    raise SystemExit(client_main())
@@ -3,10 +3,19 @@
 from __future__ import annotations
 
 from terminal_ai.io.command_runner import CommandExecutionResult, CommandRunner
-from terminal_ai.io.language_model_client import LanguageModelClient, OpenAIChatClient
+from terminal_ai.io.language_model_client import (
+    AsyncOpenAIChatClient,
+    BatchOpenAIChatClient,
+    LanguageModelClient,
+    OpenAIChatClient,
+)
+from terminal_ai.io.llm_cache import CachingLanguageModelClient
 from terminal_ai.io.prompt_loader import load_prompt
 
 __all__ = [
+    "AsyncOpenAIChatClient",
+    "BatchOpenAIChatClient",
+    "CachingLanguageModelClient",
     "CommandExecutionResult",
     "CommandRunner",
     "LanguageModelClient",
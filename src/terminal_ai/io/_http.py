@@ -0,0 +1,159 @@
+"""Keep-alive HTTP connection pooling built on :mod:`http.client`."""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import threading
+from typing import Mapping
+from urllib.parse import unquote, urlsplit
+
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent connections to a single origin.
+
+    Connections are handed out one request at a time and returned once the
+    response body has been fully read, so later requests skip the TCP and TLS
+    handshakes. Proxies configured the way :mod:`urllib.request` reads them
+    (``HTTPS_PROXY``, ``HTTP_PROXY``, ``NO_PROXY``) are honoured; HTTPS goes
+    through a ``CONNECT`` tunnel.
+    """
+
+    def __init__(self, base_url: str, *, timeout: float, max_idle: int = 10) -> None:
+        parts = urlsplit(base_url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported base URL: {base_url}")
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path_prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._proxy, self._proxy_headers = _resolve_proxy(parts.scheme, self._host)
+        if self._proxy is not None and not self._https:
+            # Plain HTTP proxies take the absolute URL and the credentials per request.
+            self._path_prefix = f"http://{parts.netloc.rpartition('@')[2]}{self._path_prefix}"
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        body: bytes | None = None,
+        headers: Mapping[str, str],
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request and return the connection with its unread response.
+
+        Callers must hand both back through :meth:`release` when done.
+        """
+
+        url = self._path_prefix + path
+        if self._proxy_headers and not self._https:
+            headers = {**headers, **self._proxy_headers}
+        conn, reused = self._acquire()
+        try:
+            conn.request(method, url, body=body, headers=dict(headers))
+            return conn, conn.getresponse()
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+        except BaseException:
+            conn.close()
+            raise
+
+        # The server dropped an idle keep-alive connection; retry once on a new one.
+        conn = self._connect()
+        try:
+            conn.request(method, url, body=body, headers=dict(headers))
+            return conn, conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+
+    def release(
+        self,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        """Return ``conn`` to the pool if ``response`` left it reusable."""
+
+        if not response.isclosed() or response.will_close:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def reserve(self, connections: int) -> None:
+        """Keep at least ``connections`` idle sockets alive between requests.
+
+        Concurrent callers size the pool to their parallelism so a batch reuses
+        the same warm connections instead of closing the overflow after each wave.
+        """
+
+        with self._lock:
+            self._max_idle = max(self._max_idle, connections)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._proxy is not None:
+            proxy_host, proxy_port = self._proxy
+            if not self._https:
+                return http.client.HTTPConnection(
+                    proxy_host, proxy_port, timeout=self._timeout
+                )
+            conn = http.client.HTTPSConnection(
+                proxy_host, proxy_port, timeout=self._timeout
+            )
+            conn.set_tunnel(self._host, self._port, headers=self._proxy_headers)
+            return conn
+        if self._https:
+            return http.client.HTTPSConnection(
+                self._host, self._port, timeout=self._timeout
+            )
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+
+def _resolve_proxy(
+    scheme: str, host: str
+) -> tuple[tuple[str, int] | None, dict[str, str]]:
+    """Return the ``(host, port)`` of the proxy for ``host`` and its auth headers."""
+
+    # Deferred: urllib.request is only needed once a client is constructed.
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None, {}
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if not parts.hostname:
+        return None, {}
+    headers: dict[str, str] = {}
+    if parts.username:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    default_port = 443 if parts.scheme == "https" else 80
+    return (parts.hostname, parts.port or default_port), headers
@@ -0,0 +1,32 @@
+"""JSON encoding helpers that use :mod:`orjson` when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# ``orjson.JSONDecodeError`` subclasses this, so callers can catch one type.
+JSONDecodeError = json.JSONDecodeError
+
+loads: Callable[[str | bytes], Any]
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Return ``obj`` as compact UTF-8 encoded JSON."""
+
+        return orjson.dumps(obj)
+
+else:  # pragma: no cover - depends on the environment
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Return ``obj`` as compact UTF-8 encoded JSON."""
+
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
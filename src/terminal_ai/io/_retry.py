@@ -0,0 +1,58 @@
+"""Retry with exponential backoff for transient model API failures."""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, TypeVar
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_T = TypeVar("_T")
+
+
+class TransientAPIError(RuntimeError):
+    """Raised for failures worth retrying, such as rate limits or dropped sockets."""
+
+    def __init__(self, message: str, *, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the ``Retry-After`` delay in seconds, ignoring HTTP-date values."""
+
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        return None
+    return delay if delay >= 0 else None
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: float | None = None,
+    *,
+    max_delay: float = 10.0,
+    max_retry_after: float = 60.0,
+) -> float:
+    """Return seconds to wait before retry number ``attempt + 1``."""
+
+    if retry_after is not None:
+        return min(retry_after, max_retry_after)
+    return min(2**attempt + random.random(), max_delay)
+
+
+def call_with_retry(func: Callable[[], _T], *, attempts: int = 3) -> _T:
+    """Call ``func``, retrying :class:`TransientAPIError` up to ``attempts`` times."""
+
+    for attempt in range(attempts):
+        try:
+            return func()
+        except TransientAPIError as exc:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(backoff_delay(attempt, exc.retry_after))
+    raise AssertionError("unreachable")  # pragma: no cover
@@ -2,11 +2,74 @@
 
 from __future__ import annotations
 
+import codecs
+import io
+import locale
 import os
+import selectors
 import subprocess
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Mapping
+from typing import IO, Any, Mapping, TextIO
+
+# Characters that need shell parsing (quoting, expansion, redirection, control flow).
+_SHELL_METACHARACTERS = frozenset("|&;<>()$`\\\"'*?[]{}~#\n")
+# First words that only the shell understands: builtins and reserved words.
+_SHELL_BUILTINS = frozenset(
+    {
+        "!",
+        ".",
+        "[[",
+        "alias",
+        "bg",
+        "builtin",
+        "case",
+        "cd",
+        "coproc",
+        "command",
+        "declare",
+        "dirs",
+        "do",
+        "done",
+        "elif",
+        "else",
+        "esac",
+        "eval",
+        "exec",
+        "exit",
+        "export",
+        "fg",
+        "fi",
+        "for",
+        "function",
+        "hash",
+        "history",
+        "if",
+        "jobs",
+        "let",
+        "local",
+        "popd",
+        "pushd",
+        "read",
+        "return",
+        "select",
+        "set",
+        "shopt",
+        "source",
+        "then",
+        "time",
+        "trap",
+        "type",
+        "ulimit",
+        "umask",
+        "unalias",
+        "unset",
+        "until",
+        "wait",
+        "while",
+    }
+)
 
 
 @dataclass(slots=True)
@@ -24,7 +87,7 @@ class CommandExecutionResult:
 
 
 class CommandRunner:
-    """Simple wrapper around ``subprocess.run`` with sensible defaults."""
+    """Simple wrapper around ``subprocess`` with sensible defaults."""
 
     def __init__(self, shell: str = "/bin/bash", dry_run: bool = False) -> None:
         self.shell = shell
@@ -36,27 +99,120 @@ class CommandRunner:
         *,
         cwd: Path | None = None,
         env: Mapping[str, str] | None = None,
+        stream: bool = False,
+        capture: bool = True,
     ) -> CommandExecutionResult:
+        """Run ``command`` through the configured shell.
+
+        With ``stream`` the output is forwarded to ``sys.stdout``/``sys.stderr`` as it
+        arrives. ``capture`` keeps it on the returned result; streaming without
+        capturing lets the child write straight to this process's file descriptors.
+        """
+
         if self.dry_run:
             return CommandExecutionResult(command=command, returncode=0, stdout="", stderr="")
 
-        full_env = os.environ.copy()
-        if env:
-            full_env.update(env)
+        # Without overrides the child inherits the environment directly.
+        full_env = {**os.environ, **env} if env else None
+        cwd_arg = str(cwd) if cwd else None
 
-        completed = subprocess.run(
+        if stream and capture:
+            return self._execute_tee(command, cwd=cwd_arg, env=full_env)
+
+        output = subprocess.PIPE if capture else (None if stream else subprocess.DEVNULL)
+        if output is None:
+            # The child writes straight to our descriptors; emit our buffered text first.
+            sys.stdout.flush()
+            sys.stderr.flush()
+        with self._popen(
             command,
-            capture_output=True,
+            stdout=output,
+            stderr=output,
             text=True,
-            shell=True,
-            executable=self.shell,
-            cwd=str(cwd) if cwd else None,
+            cwd=cwd_arg,
             env=full_env,
-            check=False,
+        ) as process:
+            stdout, stderr = process.communicate()
+        return CommandExecutionResult(
+            command=command,
+            returncode=process.returncode,
+            stdout=stdout or "",
+            stderr=stderr or "",
         )
+
+    def _popen(self, command: str, **kwargs: Any) -> subprocess.Popen[Any]:
+        """Start ``command``, bypassing the shell when it is a plain argv."""
+
+        argv = _direct_argv(command)
+        if argv is not None:
+            try:
+                return subprocess.Popen(argv, **kwargs)
+            except OSError:
+                # Let the shell report missing or non-executable programs.
+                pass
+        return subprocess.Popen(command, shell=True, executable=self.shell, **kwargs)
+
+    def _execute_tee(
+        self,
+        command: str,
+        *,
+        cwd: str | None,
+        env: Mapping[str, str] | None,
+    ) -> CommandExecutionResult:
+        process = self._popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+        )
+        assert process.stdout is not None and process.stderr is not None
+        stdout_buffer = io.StringIO()
+        stderr_buffer = io.StringIO()
+        with process, selectors.DefaultSelector() as selector:
+            _register(selector, process.stdout, sys.stdout, stdout_buffer)
+            _register(selector, process.stderr, sys.stderr, stderr_buffer)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    target, buffer, decoder = key.data
+                    chunk = os.read(key.fd, 65536)
+                    if chunk:
+                        text = decoder.decode(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+                        text = decoder.decode(b"", final=True)
+                    if text:
+                        target.write(text)
+                        target.flush()
+                        buffer.write(text)
+            returncode = process.wait()
+
         return CommandExecutionResult(
             command=command,
-            returncode=completed.returncode,
-            stdout=completed.stdout,
-            stderr=completed.stderr,
+            returncode=returncode,
+            stdout=stdout_buffer.getvalue(),
+            stderr=stderr_buffer.getvalue(),
         )
+
+
+def _direct_argv(command: str) -> list[str] | None:
+    """Return the argv for ``command`` if it needs no shell features, else ``None``."""
+
+    if not _SHELL_METACHARACTERS.isdisjoint(command):
+        return None
+    argv = command.split()
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
+
+def _register(
+    selector: selectors.BaseSelector,
+    pipe: IO[bytes],
+    target: TextIO,
+    buffer: io.StringIO,
+) -> None:
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(
+        errors="replace"
+    )
+    selector.register(pipe, selectors.EVENT_READ, (target, buffer, decoder))
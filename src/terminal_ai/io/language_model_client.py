@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
-import json
-import urllib.error
-import urllib.request
-from dataclasses import dataclass
-from typing import Protocol
+import functools
+import http.client
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Protocol, Sequence
+
+from terminal_ai.io import _json
+from terminal_ai.io._http import ConnectionPool
+from terminal_ai.io._retry import (
+    RETRYABLE_STATUSES,
+    TransientAPIError,
+    call_with_retry,
+    parse_retry_after,
+)
 
 
 class LanguageModelClient(Protocol):
@@ -25,12 +35,20 @@ class LanguageModelClient(Protocol):
 
 @dataclass(slots=True)
 class OpenAIChatClient:
-    """Minimal synchronous client using OpenAI's chat completions API."""
+    """Minimal synchronous client using OpenAI's chat completions API.
+
+    Connections are kept alive and reused across calls; call :meth:`close` to
+    release them early.
+    """
 
     model: str
     api_key: str
     base_url: str = "https://api.openai.com/v1"
     timeout: float = 30.0
+    _pool: ConnectionPool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._pool = ConnectionPool(self.base_url, timeout=self.timeout)
 
     def complete(
         self,
@@ -39,39 +57,10 @@ class OpenAIChatClient:
         user_prompt: str,
         temperature: float = 0.0,
     ) -> str:
-        payload = json.dumps(
-            {
-                "model": self.model,
-                "temperature": temperature,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-            }
-        ).encode("utf-8")
-
-        request = urllib.request.Request(
-            f"{self.base_url}/chat/completions",
-            data=payload,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            method="POST",
-        )
+        payload = self._encode_chat_body(system_prompt, user_prompt, temperature)
 
-        try:
-            with urllib.request.urlopen(request, timeout=self.timeout) as response:  # type: ignore[arg-type]
-                raw_body = response.read()
-        except urllib.error.HTTPError as exc:  # pragma: no cover - network path
-            detail = exc.read().decode("utf-8", "ignore") if hasattr(exc, "read") else ""
-            raise RuntimeError(
-                f"OpenAI API error: {exc.code} {exc.reason}. {detail}".strip()
-            ) from exc
-        except urllib.error.URLError as exc:  # pragma: no cover - network path
-            raise RuntimeError(f"Failed to reach OpenAI API: {exc.reason if hasattr(exc, 'reason') else exc}") from exc
-
-        data = json.loads(raw_body.decode("utf-8"))
+        raw_body = self._post("/chat/completions", payload)
+        data = _json.loads(raw_body)
 
         try:
             raw_message = data["choices"][0]["message"]["content"]
@@ -81,3 +70,400 @@ class OpenAIChatClient:
         if not isinstance(raw_message, str):
             raise RuntimeError("OpenAI API returned non-text content")
         return raw_message.strip()
+
+    def complete_stream(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.0,
+    ) -> Iterator[str]:
+        """Yield completion text deltas as the server streams them."""
+
+        payload = self._encode_chat_body(
+            system_prompt, user_prompt, temperature, stream=True
+        )
+
+        conn, response = call_with_retry(
+            lambda: self._open("POST", "/chat/completions", payload)
+        )
+        try:
+            for raw_line in response:
+                line = raw_line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    response.read()
+                    break
+                try:
+                    delta = _json.loads(data)["choices"][0]["delta"].get("content")
+                except (KeyError, IndexError, ValueError) as exc:  # pragma: no cover - API contract change
+                    raise RuntimeError("Unexpected stream chunk from OpenAI API") from exc
+                if delta:
+                    yield delta
+        except (OSError, http.client.HTTPException) as exc:
+            raise RuntimeError(f"OpenAI API stream interrupted: {exc}") from exc
+        finally:
+            self._pool.release(conn, response)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def __del__(self) -> None:
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.close()
+
+    def _chat_body(
+        self, system_prompt: str, user_prompt: str, temperature: float
+    ) -> dict[str, object]:
+        return {
+            "model": self.model,
+            "temperature": temperature,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        }
+
+    def _encode_chat_body(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        *,
+        stream: bool = False,
+    ) -> bytes:
+        """Encode the same document as :meth:`_chat_body` from cached fragments.
+
+        The system prompt is usually identical across a session, so its encoded
+        message is reused and only the user message is serialised per call.
+        """
+
+        return b"".join(
+            (
+                _encode_body_prefix(self.model, temperature, stream),
+                _encode_system_message(system_prompt),
+                b",",
+                _json.dumps({"role": "user", "content": user_prompt}),
+                b"]}",
+            )
+        )
+
+    def _headers(self, content_type: str = "application/json") -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": content_type,
+        }
+
+    def _post(self, path: str, payload: bytes, *, idempotent: bool = True) -> bytes:
+        return self._request("POST", path, payload, idempotent=idempotent)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        *,
+        content_type: str = "application/json",
+        idempotent: bool = True,
+    ) -> bytes:
+        """Send a request, retrying transient failures.
+
+        Connection failures of non-``idempotent`` requests are not retried: the
+        server may already have acted on them. Error statuses still are.
+        """
+
+        return call_with_retry(
+            lambda: self._request_once(method, path, body, content_type, idempotent)
+        )
+
+    def _request_once(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        content_type: str,
+        idempotent: bool = True,
+    ) -> bytes:
+        conn, response = self._open(
+            method, path, body, content_type=content_type, idempotent=idempotent
+        )
+        try:
+            return response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            raise _transport_error(exc, idempotent) from exc
+        finally:
+            self._pool.release(conn, response)
+
+    def _open(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        *,
+        content_type: str = "application/json",
+        idempotent: bool = True,
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send the request and return the pooled connection with a 2xx response.
+
+        Error responses are drained and released so the connection stays reusable.
+        """
+
+        try:
+            conn, response = self._pool.request(
+                method, path, body=body, headers=self._headers(content_type)
+            )
+        except (OSError, http.client.HTTPException) as exc:
+            raise _transport_error(exc, idempotent) from exc
+
+        if response.status < 400:
+            return conn, response
+
+        try:
+            detail = response.read().decode("utf-8", "ignore")
+        except (OSError, http.client.HTTPException):
+            detail = ""
+        finally:
+            self._pool.release(conn, response)
+        message = f"OpenAI API error: {response.status} {response.reason}. {detail}".strip()
+        if response.status in RETRYABLE_STATUSES:
+            raise TransientAPIError(
+                message, retry_after=parse_retry_after(response.getheader("Retry-After"))
+            )
+        raise RuntimeError(message)
+
+
+def _transport_error(exc: BaseException, idempotent: bool) -> RuntimeError:
+    if idempotent:
+        return TransientAPIError(f"Failed to reach OpenAI API: {exc}")
+    return RuntimeError(
+        f"Lost connection to OpenAI API; the request may have gone through: {exc}"
+    )
+
+
+@dataclass(slots=True)
+class AsyncOpenAIChatClient(OpenAIChatClient):
+    """Chat client adding awaitable and bounded-concurrency completions.
+
+    Requests still go through the blocking transport of :class:`OpenAIChatClient`;
+    each one runs on a worker thread so many prompts can be in flight at once.
+    """
+
+    async def acomplete(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.0,
+    ) -> str:
+        import asyncio
+
+        return await asyncio.to_thread(
+            self.complete,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+        )
+
+    async def complete_many(
+        self,
+        prompts: Sequence[tuple[str, str]],
+        *,
+        temperature: float = 0.0,
+        max_concurrency: int = 10,
+    ) -> list[str | BaseException]:
+        """Complete ``(system_prompt, user_prompt)`` pairs concurrently.
+
+        Results keep the order of ``prompts``; failed requests are returned as the
+        raised exception instead of aborting the whole batch.
+        """
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        # Imported here so interactive runs never load asyncio or concurrent.futures.
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._pool.reserve(max_concurrency)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+            async def _run(system_prompt: str, user_prompt: str) -> str:
+                async with semaphore:
+                    return await loop.run_in_executor(
+                        executor,
+                        lambda: self.complete(
+                            system_prompt=system_prompt,
+                            user_prompt=user_prompt,
+                            temperature=temperature,
+                        ),
+                    )
+
+            return await asyncio.gather(
+                *(_run(system, user) for system, user in prompts),
+                return_exceptions=True,
+            )
+
+
+@functools.lru_cache(maxsize=8)
+def _encode_body_prefix(model: str, temperature: float, stream: bool) -> bytes:
+    head: dict[str, object] = {"model": model, "temperature": temperature}
+    if stream:
+        head["stream"] = True
+    return _json.dumps(head)[:-1] + b',"messages":['
+
+
+@functools.lru_cache(maxsize=8)
+def _encode_system_message(system_prompt: str) -> bytes:
+    return _json.dumps({"role": "system", "content": system_prompt})
+
+
+_BATCH_FAILED_STATUSES = frozenset({"failed", "expired", "cancelled"})
+
+
+@dataclass(slots=True)
+class BatchOpenAIChatClient(OpenAIChatClient):
+    """Chat client that routes bulk completions through OpenAI's Batch API.
+
+    Batches are cheaper and have separate rate limits but may take up to the
+    completion window to finish, so this suits offline runs, not interactive use.
+    :meth:`complete_many` resumes ``batch_id`` when set instead of submitting, and
+    reports the id of a new batch to ``on_submit`` before waiting on it.
+    """
+
+    poll_interval: float = 10.0
+    max_poll_interval: float = 60.0
+    batch_id: str | None = None
+    on_submit: Callable[[str], None] | None = None
+
+    def submit(
+        self,
+        prompts: Sequence[tuple[str, str]],
+        *,
+        temperature: float = 0.0,
+    ) -> str:
+        """Upload ``(system_prompt, user_prompt)`` pairs and return the batch id.
+
+        Each request's ``custom_id`` is its index in ``prompts``.
+        """
+
+        lines = [
+            _json.dumps(
+                {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._chat_body(system_prompt, user_prompt, temperature),
+                }
+            )
+            for index, (system_prompt, user_prompt) in enumerate(prompts)
+        ]
+        boundary = uuid.uuid4().hex
+        body = b"".join(
+            (
+                f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="purpose"\r\n\r\n'
+                f"batch\r\n--{boundary}\r\n"
+                'Content-Disposition: form-data; name="file"; filename="requests.jsonl"\r\n'
+                "Content-Type: application/jsonl\r\n\r\n".encode("utf-8"),
+                b"\n".join(lines),
+                f"\r\n--{boundary}--\r\n".encode("utf-8"),
+            )
+        )
+        uploaded = _json.loads(
+            self._request(
+                "POST",
+                "/files",
+                body,
+                content_type=f"multipart/form-data; boundary={boundary}",
+            )
+        )
+        batch = _json.loads(
+            self._post(
+                "/batches",
+                _json.dumps(
+                    {
+                        "input_file_id": uploaded["id"],
+                        "endpoint": "/v1/chat/completions",
+                        "completion_window": "24h",
+                    }
+                ),
+                # A retry after a lost response could create a second paid batch.
+                idempotent=False,
+            )
+        )
+        return str(batch["id"])
+
+    def wait(self, batch_id: str) -> list[tuple[str, str | RuntimeError]]:
+        """Poll until the batch finishes and return ``(custom_id, content)`` pairs.
+
+        Requests that failed inside the batch carry a ``RuntimeError`` instead of
+        their content.
+        """
+
+        delay = self.poll_interval
+        while True:
+            batch = _json.loads(self._request("GET", f"/batches/{batch_id}"))
+            status = batch.get("status")
+            if status == "completed":
+                break
+            if status in _BATCH_FAILED_STATUSES:
+                raise RuntimeError(f"OpenAI batch {batch_id} ended with status {status}")
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+        results: list[tuple[str, str | RuntimeError]] = []
+        for file_key in ("output_file_id", "error_file_id"):
+            file_id = batch.get(file_key)
+            if not file_id:
+                continue
+            content = self._request("GET", f"/files/{file_id}/content")
+            for line in content.splitlines():
+                if line.strip():
+                    results.append(_parse_batch_result(_json.loads(line)))
+        return results
+
+    async def complete_many(
+        self,
+        prompts: Sequence[tuple[str, str]],
+        *,
+        temperature: float = 0.0,
+        max_concurrency: int = 10,
+    ) -> list[str | BaseException]:
+        """Complete ``prompts`` as one batch; ``max_concurrency`` is ignored."""
+
+        import asyncio
+
+        def _run() -> list[tuple[str, str | RuntimeError]]:
+            if self.batch_id is None:
+                self.batch_id = self.submit(prompts, temperature=temperature)
+                if self.on_submit is not None:
+                    self.on_submit(self.batch_id)
+            return self.wait(self.batch_id)
+
+        by_id = dict(await asyncio.to_thread(_run))
+        return [
+            by_id.get(str(index), RuntimeError("OpenAI batch returned no result"))
+            for index in range(len(prompts))
+        ]
+
+
+def _parse_batch_result(entry: dict[str, object]) -> tuple[str, str | RuntimeError]:
+    custom_id = str(entry.get("custom_id"))
+    error = entry.get("error")
+    response = entry.get("response") or {}
+    if error or not isinstance(response, dict) or response.get("status_code") != 200:
+        detail = error or (response.get("body") if isinstance(response, dict) else None)
+        return custom_id, RuntimeError(f"OpenAI batch request failed: {detail}")
+    try:
+        content = response["body"]["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return custom_id, RuntimeError("Unexpected batch result from OpenAI API")
+    if not isinstance(content, str):
+        return custom_id, RuntimeError("OpenAI API returned non-text content")
+    return custom_id, content.strip()
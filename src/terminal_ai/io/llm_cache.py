@@ -0,0 +1,200 @@
+"""Persistent response cache wrapping any language model client."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from terminal_ai.io.language_model_client import LanguageModelClient
+
+_ENV_VAR = "TERMINAL_AI_CACHE_DIR"
+_DB_NAME = "llm.sqlite"
+
+
+def default_cache_path() -> Path:
+    """Return the cache database path, honouring ``TERMINAL_AI_CACHE_DIR``."""
+
+    env_override = os.getenv(_ENV_VAR)
+    directory = (
+        Path(env_override).expanduser()
+        if env_override
+        else Path.home() / ".cache" / "terminal_ai"
+    )
+    return directory / _DB_NAME
+
+
+def clear_cache(path: Path | None = None) -> None:
+    """Delete the cache database; a missing cache is not an error."""
+
+    (path or default_cache_path()).unlink(missing_ok=True)
+
+
+def cache_key(
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    user_prompt: str,
+    *,
+    base_url: str = "",
+) -> bytes:
+    header = f"{base_url}|{model}|{temperature}|".encode("utf-8")
+    return hashlib.blake2b(
+        header + system_prompt.encode("utf-8") + b"\0" + user_prompt.encode("utf-8"),
+        digest_size=16,
+    ).digest()
+
+
+class CachingLanguageModelClient:
+    """Serve repeated deterministic completions from an on-disk SQLite cache.
+
+    Only ``temperature == 0`` requests are cached since other samples are not
+    meant to be reproducible. Cache errors never fail a request; the wrapped
+    client is simply called instead.
+
+    ``validate`` is called on each fresh response before it is stored; responses
+    it rejects by raising are still returned but never cached, so a malformed
+    reply can be retried.
+    """
+
+    def __init__(
+        self,
+        client: LanguageModelClient,
+        *,
+        model: str,
+        base_url: str = "",
+        path: Path | None = None,
+        validate: Callable[[str], object] | None = None,
+    ) -> None:
+        self._client = client
+        self._model = model
+        self._base_url = base_url
+        self._validate = validate
+        self._path = path or default_cache_path()
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def complete(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.0,
+    ) -> str:
+        if temperature != 0:
+            return self._client.complete(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+            )
+
+        key = self._key(temperature, system_prompt, user_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self._client.complete(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+        )
+        self._store(key, response)
+        return response
+
+    def complete_stream(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.0,
+    ) -> Iterator[str]:
+        """Stream from the wrapped client, replaying cache hits as one chunk."""
+
+        key = self._key(temperature, system_prompt, user_prompt)
+        if temperature == 0:
+            cached = self._lookup(key)
+            if cached is not None:
+                yield cached
+                return
+
+        stream = getattr(self._client, "complete_stream", None)
+        if stream is None:
+            response = self.complete(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+            )
+            yield response
+            return
+
+        chunks: list[str] = []
+        for chunk in stream(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+        ):
+            chunks.append(chunk)
+            yield chunk
+        if temperature == 0:
+            self._store(key, "".join(chunks).strip())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _key(self, temperature: float, system_prompt: str, user_prompt: str) -> bytes:
+        return cache_key(
+            self._model, temperature, system_prompt, user_prompt, base_url=self._base_url
+        )
+
+    def _lookup(self, key: bytes) -> str | None:
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute("SELECT response FROM responses WHERE key = ?", (key,))
+                    .fetchone()
+                )
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _store(self, key: bytes, response: str) -> None:
+        if self._validate is not None:
+            try:
+                self._validate(response)
+            except Exception:
+                return
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, created_at)"
+                        " VALUES (?, ?, ?)",
+                        (key, response, int(time.time())),
+                    )
+        except sqlite3.Error:
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+            except OSError as exc:
+                raise sqlite3.OperationalError(str(exc)) from exc
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key BLOB PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+
+__all__ = ["CachingLanguageModelClient", "cache_key", "clear_cache", "default_cache_path"]
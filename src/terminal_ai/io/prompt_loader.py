@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 
@@ -9,7 +10,11 @@ _ENV_VAR = "TERMINAL_AI_PROMPTS_DIR"
 
 
 def _resolve_prompts_dir() -> Path:
-    env_override = os.getenv(_ENV_VAR)
+    return _locate_prompts_dir(os.getenv(_ENV_VAR))
+
+
+@functools.lru_cache(maxsize=4)
+def _locate_prompts_dir(env_override: str | None) -> Path:
     if env_override:
         override_path = Path(env_override).expanduser()
         if override_path.is_dir():
@@ -27,11 +32,22 @@ def _resolve_prompts_dir() -> Path:
     )
 
 
+@functools.lru_cache(maxsize=32)
+def _read_prompt(path: str) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
 def load_prompt(name: str, *, directory: Path | None = None) -> str:
-    """Return the contents of the named prompt template."""
+    """Return the contents of the named prompt template.
+
+    Directory lookups and file contents are cached for the life of the process.
+    """
 
     prompts_dir = directory or _resolve_prompts_dir()
     path = prompts_dir / name
-    if not path.is_file():
-        raise FileNotFoundError(f"Prompt template '{name}' not found in {prompts_dir}")
-    return path.read_text(encoding="utf-8")
+    try:
+        return _read_prompt(str(path))
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise FileNotFoundError(
+            f"Prompt template '{name}' not found in {prompts_dir}"
+        ) from None
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
@@ -21,6 +23,14 @@ class _StubClient:
         return self._response
 
 
+class _StreamingStubClient(_StubClient):
+    def complete_stream(
+        self, *, system_prompt: str, user_prompt: str, temperature: float = 0.0
+    ) -> Iterator[str]:
+        for start in range(0, len(self._response), 7):
+            yield self._response[start : start + 7]
+
+
 def _agent(response: str) -> TranslateCommandAgent:
     template = "Shell: {shell} | CWD: {cwd}"
     return TranslateCommandAgent(model_client=_StubClient(response), system_prompt_template=template)
@@ -46,6 +56,49 @@ def test_enforces_confirmation_for_destructive_command() -> None:
     assert suggestion.requires_confirmation is True
 
 
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        ("rm -fr build", True),
+        ("mkfs.ext4 /dev/sdb1", True),
+        ("dd if=/dev/zero of=/dev/sdb", True),
+        ("sudo shutdown -h now", True),
+        ("reboot", True),
+        ("cd /tmp && rm -rf cache", True),
+        ("find . -name '*.pyc' | xargs rm -r", True),
+        ("/sbin/poweroff", True),
+        ("sudo -u root rm -rf /", True),
+        ("nice -n 10 rm -rf /", True),
+        ("timeout 5 rm -rf x", True),
+        ("find / -exec rm -rf {} +", True),
+        ("bash -c 'rm -rf /'", True),
+        ('sh -c "shutdown now"', True),
+        ("systemctl reboot", True),
+        ("sudo systemctl reboot", True),
+        ("ssh host reboot", True),
+        ("watch rm -rf x", True),
+        ("DD if=/dev/zero of=/dev/sdb", True),
+        ("echo shutdown complete", True),
+        ("rm -rfv /tmp/x", True),
+        ("rm -vrf /", True),
+        ("rm -Rfv x", True),
+        ("sudo -u root rm -r /", True),
+        ("nice -n 10 rm -r x", True),
+        ("timeout 5 rm -r x", True),
+        ("timeout -s KILL 5 rm -r x", True),
+        ("rm -v build.log", False),
+        ("rm --verbose build.log", False),
+        ("rm build.log", False),
+        ("ls -la", False),
+    ],
+)
+def test_flags_destructive_commands(command: str, expected: bool) -> None:
+    payload = {"command": command, "explanation": "", "requires_confirmation": False, "follow_up": ""}
+    agent = _agent(json.dumps(payload))
+    suggestion = agent.suggest(CommandRequest(instruction="do it"))
+    assert suggestion.requires_confirmation is expected
+
+
 def test_allows_follow_up_only_payload() -> None:
     agent = _agent(
         '{"command": "", "explanation": "", "requires_confirmation": false, "follow_up": "Which project?"}'
@@ -55,8 +108,86 @@ def test_allows_follow_up_only_payload() -> None:
     assert suggestion.follow_up == "Which project?"
 
 
-@pytest.mark.parametrize("response", ["No JSON here", "[invalid json]"])
+def test_extracts_json_object_surrounded_by_text() -> None:
+    agent = _agent(
+        'Sure!\n```json\n{"command": "ls", "explanation": "List {files}", "follow_up": ""}\n```\nDone {ok}'
+    )
+    suggestion = agent.suggest(CommandRequest(instruction="list files"))
+    assert suggestion.command == "ls"
+    assert suggestion.explanation == "List {files}"
+
+
+@pytest.mark.parametrize("response", ["No JSON here", "[invalid json]", "{not json}"])
 def test_raises_when_response_missing_json(response: str) -> None:
     agent = _agent(response)
     with pytest.raises(CommandParsingError):
         agent.suggest(CommandRequest(instruction="noop"))
+
+
+def test_suggest_many_returns_suggestions_in_order() -> None:
+    agent = _agent(
+        '{"command": "ls -la", "explanation": "List files", "requires_confirmation": false, "follow_up": ""}'
+    )
+    results = agent.suggest_many(
+        [CommandRequest(instruction="list files"), CommandRequest(instruction="show files")]
+    )
+    assert [result.command for result in results] == ["ls -la", "ls -la"]
+
+
+def test_suggest_many_returns_parsing_errors_in_place() -> None:
+    agent = _agent("No JSON here")
+    results = agent.suggest_many([CommandRequest(instruction="noop")])
+    assert isinstance(results[0], CommandParsingError)
+
+
+def test_suggest_stream_reports_fields_as_they_close() -> None:
+    response = (
+        '{"command": "echo \\"hi\\"", "explanation": "Greet", '
+        '"requires_confirmation": false, "follow_up": ""}'
+    )
+    agent = TranslateCommandAgent(
+        model_client=_StreamingStubClient(response),
+        system_prompt_template="Shell: {shell} | CWD: {cwd}",
+    )
+    fields: list[tuple[str, str]] = []
+    suggestion = agent.suggest_stream(
+        CommandRequest(instruction="greet"), lambda name, value: fields.append((name, value))
+    )
+    assert fields == [("command", 'echo "hi"'), ("explanation", "Greet")]
+    assert suggestion.command == 'echo "hi"'
+
+
+def test_suggest_stream_falls_back_to_complete() -> None:
+    agent = _agent(
+        '{"command": "ls", "explanation": "List", "requires_confirmation": false, "follow_up": ""}'
+    )
+    fields: list[tuple[str, str]] = []
+    suggestion = agent.suggest_stream(
+        CommandRequest(instruction="list"), lambda name, value: fields.append((name, value))
+    )
+    assert fields == [("command", "ls"), ("explanation", "List")]
+    assert suggestion.command == "ls"
+
+
+def test_renders_prompt_template_like_str_format() -> None:
+    prompts: list[str] = []
+
+    class _RecordingClient(_StubClient):
+        def complete(self, *, system_prompt: str, user_prompt: str, temperature: float = 0.0) -> str:
+            prompts.append(system_prompt)
+            return super().complete(
+                system_prompt=system_prompt, user_prompt=user_prompt, temperature=temperature
+            )
+
+    template = "Shell: {shell} | CWD: {cwd} | schema: {{\"command\": ...}}"
+    agent = TranslateCommandAgent(
+        model_client=_RecordingClient('{"command": "ls", "follow_up": ""}'),
+        system_prompt_template=template,
+    )
+    agent.suggest(CommandRequest(instruction="list", cwd=Path("/tmp"), shell="/bin/zsh"))
+    assert prompts == [template.format(shell="/bin/zsh", cwd="/tmp")]
+
+
+def test_command_request_precomputes_cwd_string() -> None:
+    assert CommandRequest(instruction="x").cwd_str == "~"
+    assert CommandRequest(instruction="x", cwd=Path("/tmp")).cwd_str == "/tmp"
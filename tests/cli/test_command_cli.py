@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import io
 import json
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
@@ -22,7 +26,9 @@ class _DummyClient:
 
 def test_main_prints_command(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
     monkeypatch.setenv("OPENAI_API_KEY", "test-key")
-    monkeypatch.setattr(command_cli, "OpenAIChatClient", _DummyClient)
+    monkeypatch.setattr(
+        "terminal_ai.io.language_model_client.OpenAIChatClient", _DummyClient
+    )
     exit_code = command_cli.main(["list", "files", "--no-exec"])
     captured = capsys.readouterr()
     assert exit_code == 0
@@ -30,14 +36,135 @@ def test_main_prints_command(monkeypatch: pytest.MonkeyPatch, capsys: pytest.Cap
     assert "Why: List files" in captured.out
 
 
+def test_main_shows_final_command_when_stream_differs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _DuplicateKeyClient(_DummyClient):
+        def complete(
+            self, *, system_prompt: str, user_prompt: str, temperature: float = 0.0
+        ) -> str:
+            return (
+                '{"command": "ls", "explanation": "list", "command": "echo OTHER",'
+                ' "requires_confirmation": false, "follow_up": ""}'
+            )
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(
+        "terminal_ai.io.language_model_client.OpenAIChatClient", _DuplicateKeyClient
+    )
+    out, err = io.StringIO(), io.StringIO()
+    exit_code = command_cli.main(
+        ["list", "files"], stdout=out, stderr=err, stdin=io.StringIO("n\n")
+    )
+    assert exit_code == 0
+    assert out.getvalue().splitlines() == [
+        "Command: ls",
+        "Why: list",
+        "Command: echo OTHER",
+        "Execute command? [y/N]: Aborted.",
+    ]
+    assert "different command" in err.getvalue()
+
+
 def test_main_uses_embedded_prompt_when_missing(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("OPENAI_API_KEY", "test-key")
-    monkeypatch.setattr(command_cli, "OpenAIChatClient", _DummyClient)
+    monkeypatch.setattr(
+        "terminal_ai.io.language_model_client.OpenAIChatClient", _DummyClient
+    )
 
     def _missing_prompt(name: str) -> str:
         raise FileNotFoundError("missing")
 
-    monkeypatch.setattr(command_cli, "load_prompt", _missing_prompt)
+    monkeypatch.setattr("terminal_ai.io.prompt_loader.load_prompt", _missing_prompt)
 
     exit_code = command_cli.main(["list", "files", "--no-exec"])
     assert exit_code == 0
+
+
+def test_main_clear_cache_without_instruction(capsys: pytest.CaptureFixture[str]) -> None:
+    exit_code = command_cli.main(["--clear-cache"])
+    assert exit_code == 0
+    assert "cache cleared" in capsys.readouterr().out
+
+
+def test_cli_import_defers_runtime_modules() -> None:
+    src = Path(command_cli.__file__).resolve().parents[2]
+    probe = "import sys, terminal_ai.cli; print(sorted(m for m in sys.modules if m.startswith('terminal_ai.')))"
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(src)},
+    ).stdout
+    assert "terminal_ai.io" not in output
+    assert "terminal_ai.agents" not in output
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["list", "files"],
+        ["--no-exec", "list", "files"],
+        ["list", "files", "--model", "gpt-x", "--temperature=0.3"],
+        ["--cwd", "/tmp", "--accept", "--dry-run", "-", "kill", "port", "3000"],
+        ["--prompt=", "--shell", "/bin/zsh", "--allow-destructive", "--no-cache"],
+        ["--api-key", "k", "--base-url", "http://localhost:8080/v1", "--clear-cache"],
+    ],
+)
+def test_fast_parser_matches_argparse(argv: list[str]) -> None:
+    fast = command_cli._parse_argv(argv)
+    assert fast is not None
+    assert vars(fast) == vars(command_cli._build_parser().parse_args(argv))
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--help"],
+        ["--acc", "list"],
+        ["list", "--no-exec", "files"],
+        ["--model"],
+        ["--temperature", "-0.5"],
+        ["--temperature", "hot"],
+        ["--accept=yes"],
+        ["--", "-rf"],
+    ],
+)
+def test_fast_parser_defers_unusual_argv(argv: list[str]) -> None:
+    assert command_cli._parse_argv(argv) is None
+
+
+def test_main_batch_prints_each_suggestion(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    class _DummyBatchClient(_DummyClient):
+        def __init__(self, *, batch_id: str | None, on_submit: object, **kwargs: str) -> None:
+            super().__init__(**kwargs)
+            self._on_submit = on_submit
+
+        async def complete_many(
+            self, prompts: list[tuple[str, str]], *, temperature: float, max_concurrency: int
+        ) -> list[object]:
+            self._on_submit("batch-1")
+            return [json.dumps(self._payload), RuntimeError("rejected")]
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(
+        "terminal_ai.io.language_model_client.BatchOpenAIChatClient", _DummyBatchClient
+    )
+    batch_file = tmp_path / "tasks.txt"
+    batch_file.write_text("list files\n\nremove everything\n", encoding="utf-8")
+
+    exit_code = command_cli.main(["--batch", str(batch_file)])
+    captured = capsys.readouterr()
+    assert exit_code == 2
+    assert "# list files\nCommand: ls\nWhy: List files\n# remove everything\n" == captured.out
+    assert "rejected" in captured.err
+    assert "--batch-id batch-1" in captured.err
+
+
+def test_main_batch_id_requires_batch_file(capsys: pytest.CaptureFixture[str]) -> None:
+    assert command_cli.main(["--batch-id", "batch-1"]) == 1
+    assert "--batch-id requires" in capsys.readouterr().err
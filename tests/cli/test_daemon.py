@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from terminal_ai.cli import daemon
+
+
+class _DummyClient:
+    instances = 0
+
+    def __init__(self, *, model: str, api_key: str, base_url: str) -> None:
+        _DummyClient.instances += 1
+
+    def complete(self, *, system_prompt: str, user_prompt: str, temperature: float = 0.0) -> str:
+        return json.dumps(
+            {"command": "pwd", "explanation": "Show directory", "requires_confirmation": False, "follow_up": ""}
+        )
+
+
+def _exchange(message: bytes, clients: dict | None = None) -> dict[str, object]:
+    client, server = socket.socketpair()
+    with client, server:
+        client.sendall(message)
+        client.shutdown(socket.SHUT_WR)
+        daemon._handle(server, {} if clients is None else clients)
+        server.shutdown(socket.SHUT_WR)
+        return json.loads(daemon._read_all(client))
+
+
+@pytest.fixture(autouse=True)
+def _dummy_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr("terminal_ai.io.language_model_client.OpenAIChatClient", _DummyClient)
+
+
+def test_handle_returns_command_instead_of_running_it(tmp_path: Path) -> None:
+    message = {"argv": ["show", "directory"], "cwd": str(tmp_path)}
+    response = _exchange(json.dumps(message).encode("utf-8") + b"\n")
+    assert response["code"] == 0
+    assert response["stdout"] == "Command: pwd\nWhy: Show directory\n"
+    assert response["command"] == {
+        "command": "pwd",
+        "requires_confirmation": False,
+        "cwd": str(tmp_path.resolve()),
+        "shell": "/bin/bash",
+        "dry_run": False,
+    }
+
+
+def test_handle_reuses_model_clients() -> None:
+    clients: dict = {}
+    before = _DummyClient.instances
+    for _ in range(2):
+        _exchange(json.dumps({"argv": ["show", "directory", "--no-exec"]}).encode("utf-8"), clients)
+    assert _DummyClient.instances == before + 1
+    assert len(clients) == 1
+
+
+def test_handle_reports_argparse_errors() -> None:
+    response = _exchange(json.dumps({"argv": ["--temperature", "hot"]}).encode("utf-8"))
+    assert response["code"] == 2
+    assert "invalid float value" in str(response["stderr"])
+
+
+def test_handle_rejects_nested_daemon() -> None:
+    response = _exchange(json.dumps({"argv": ["--daemon"]}).encode("utf-8"))
+    assert response["code"] == 1
+
+
+def test_handle_rejects_malformed_request() -> None:
+    response = _exchange(b"not json")
+    assert response["code"] == 1
+    assert "Invalid daemon request" in str(response["stderr"])
+
+
+def test_client_falls_back_without_daemon(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("TERMINAL_AI_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+    assert daemon.client_main(["show", "directory", "--no-exec"]) == 0
+    assert "Command: pwd" in capsys.readouterr().out
+
+
+@pytest.fixture
+def fake_daemon(tmp_path: Path) -> Iterator[Path]:
+    """Answer one request on a temporary socket with a destructive suggestion."""
+
+    path = tmp_path / "daemon.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen()
+    response = {
+        "stdout": "Command: rm -rf build\n",
+        "stderr": "",
+        "code": 0,
+        "command": {
+            "command": "rm -rf build",
+            "requires_confirmation": True,
+            "cwd": str(tmp_path),
+        },
+    }
+
+    def _serve() -> None:
+        conn, _ = listener.accept()
+        with conn:
+            daemon._read_all(conn)
+            conn.sendall(json.dumps(response).encode("utf-8"))
+
+    thread = threading.Thread(target=_serve)
+    thread.start()
+    try:
+        yield path
+    finally:
+        thread.join(timeout=5)
+        listener.close()
+
+
+def test_client_confirms_command_locally(
+    monkeypatch: pytest.MonkeyPatch, fake_daemon: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    prompts: list[str] = []
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or "n")
+    assert daemon.request(["clean", "build"], path=fake_daemon) == 0
+    assert prompts == ["Execute command? [y/N]: "]
+    assert capsys.readouterr().out == "Command: rm -rf build\nAborted.\n"
+
+
+def test_client_does_not_rerun_after_command_errors(
+    monkeypatch: pytest.MonkeyPatch, fake_daemon: Path
+) -> None:
+    def _missing_shell(command: str, **kwargs: object) -> int:
+        raise FileNotFoundError("/bin/missing-shell")
+
+    def _in_process(argv: list[str]) -> int:
+        raise AssertionError("fell back to an in-process run")
+
+    monkeypatch.setenv("TERMINAL_AI_DAEMON_SOCKET", str(fake_daemon))
+    monkeypatch.setattr("terminal_ai.cli.command_cli.run_command", _missing_shell)
+    monkeypatch.setattr("terminal_ai.cli.command_cli.main", _in_process)
+    with pytest.raises(FileNotFoundError):
+        daemon.client_main(["clean", "build"])
+
+
+def test_client_runs_batches_in_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+    monkeypatch.setattr(
+        "terminal_ai.cli.command_cli.main", lambda argv: calls.append(argv) or 0
+    )
+    monkeypatch.setattr(daemon, "_connect", lambda path: pytest.fail("contacted daemon"))
+    assert daemon.client_main(["--batch=tasks.txt"]) == 0
+    assert calls == [["--batch=tasks.txt"]]
+
+
+def test_handle_rejects_batch_runs(tmp_path: Path) -> None:
+    message = {"argv": ["--batch", str(tmp_path / "tasks.txt")]}
+    response = _exchange(json.dumps(message).encode("utf-8"))
+    assert response["code"] == 1
+    assert "--batch cannot" in str(response["stderr"])
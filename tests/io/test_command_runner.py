@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from terminal_ai.io import command_runner
+from terminal_ai.io.command_runner import CommandRunner, _direct_argv
+
+
+def test_execute_captures_output(tmp_path: Path) -> None:
+    result = CommandRunner(shell="/bin/sh").execute("pwd; echo oops >&2", cwd=tmp_path)
+    assert result.succeeded
+    assert result.stdout.strip() == str(tmp_path.resolve())
+    assert result.stderr == "oops\n"
+
+
+def test_execute_merges_env_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TERMINAL_AI_TEST_BASE", "base")
+    runner = CommandRunner(shell="/bin/sh")
+    command = 'echo "$TERMINAL_AI_TEST_BASE-$GREETING"'
+    assert runner.execute(command).stdout == "base-\n"
+    assert runner.execute(command, env={"GREETING": "hi"}).stdout == "base-hi\n"
+
+
+def test_execute_streams_and_captures(capsys: pytest.CaptureFixture[str]) -> None:
+    result = CommandRunner(shell="/bin/sh").execute(
+        "echo out; echo err >&2; exit 3", stream=True
+    )
+    captured = capsys.readouterr()
+    assert result.returncode == 3
+    assert (result.stdout, result.stderr) == ("out\n", "err\n")
+    assert (captured.out, captured.err) == ("out\n", "err\n")
+
+
+def test_execute_stream_only_inherits_descriptors(capfd: pytest.CaptureFixture[str]) -> None:
+    result = CommandRunner(shell="/bin/sh").execute(
+        "echo out", env={"GREETING": "hi"}, stream=True, capture=False
+    )
+    assert result.succeeded
+    assert result.stdout == ""
+    assert capfd.readouterr().out == "out\n"
+
+
+def test_execute_stream_only_flushes_pending_output() -> None:
+    script = (
+        "from terminal_ai.io.command_runner import CommandRunner\n"
+        "print('before')\n"
+        "CommandRunner(shell='/bin/sh').execute('echo child', stream=True, capture=False)\n"
+    )
+    src = Path(command_runner.__file__).resolve().parents[2]
+    env = {**os.environ, "PYTHONPATH": str(src)}
+    env.pop("PYTHONUNBUFFERED", None)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True
+    )
+    assert result.stdout == "before\nchild\n"
+
+
+def test_execute_dry_run_skips_command() -> None:
+    result = CommandRunner(dry_run=True).execute("exit 1")
+    assert result.succeeded
+
+
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        ("ls -la /tmp", ["ls", "-la", "/tmp"]),
+        ("dd if=/dev/zero of=out bs=1 count=1", ["dd", "if=/dev/zero", "of=out", "bs=1", "count=1"]),
+        ("ls | wc -l", None),
+        ("echo $HOME", None),
+        ("ls ~/Downloads", None),
+        ("grep 'a b' file", None),
+        ("cd /tmp", None),
+        ("time make", None),
+        ("! grep -q needle file", None),
+        ("while true do sleep 1 done", None),
+        ("FOO=1 env", None),
+        ("   ", None),
+    ],
+)
+def test_direct_argv(command: str, expected: list[str] | None) -> None:
+    assert _direct_argv(command) == expected
+
+
+def test_execute_missing_program_falls_back_to_shell() -> None:
+    result = CommandRunner(shell="/bin/sh").execute("terminal-ai-no-such-program --flag")
+    assert result.returncode == 127
+    assert result.stderr
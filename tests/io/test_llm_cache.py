@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from terminal_ai.io.llm_cache import CachingLanguageModelClient, clear_cache
+
+
+class _CountingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(self, *, system_prompt: str, user_prompt: str, temperature: float = 0.0) -> str:
+        self.calls += 1
+        return f"{user_prompt}-{self.calls}"
+
+
+def test_reuses_deterministic_responses(tmp_path: Path) -> None:
+    inner = _CountingClient()
+    client = CachingLanguageModelClient(inner, model="gpt-test", path=tmp_path / "llm.sqlite")
+    first = client.complete(system_prompt="SYS", user_prompt="hi")
+    second = client.complete(system_prompt="SYS", user_prompt="hi")
+    assert first == second == "hi-1"
+    assert inner.calls == 1
+
+
+def test_persists_across_instances(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite"
+    CachingLanguageModelClient(_CountingClient(), model="gpt-test", path=path).complete(
+        system_prompt="SYS", user_prompt="hi"
+    )
+    inner = _CountingClient()
+    client = CachingLanguageModelClient(inner, model="gpt-test", path=path)
+    assert client.complete(system_prompt="SYS", user_prompt="hi") == "hi-1"
+    assert inner.calls == 0
+
+
+def test_skips_cache_for_sampled_requests(tmp_path: Path) -> None:
+    inner = _CountingClient()
+    client = CachingLanguageModelClient(inner, model="gpt-test", path=tmp_path / "llm.sqlite")
+    client.complete(system_prompt="SYS", user_prompt="hi", temperature=0.7)
+    client.complete(system_prompt="SYS", user_prompt="hi", temperature=0.7)
+    assert inner.calls == 2
+
+
+def test_clear_cache_drops_responses(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite"
+    client = CachingLanguageModelClient(_CountingClient(), model="gpt-test", path=path)
+    client.complete(system_prompt="SYS", user_prompt="hi")
+    client.close()
+    clear_cache(path)
+    clear_cache(path)
+    assert not path.exists()
+
+
+def test_stream_replays_cached_response(tmp_path: Path) -> None:
+    inner = _CountingClient()
+    client = CachingLanguageModelClient(inner, model="gpt-test", path=tmp_path / "llm.sqlite")
+    first = "".join(client.complete_stream(system_prompt="SYS", user_prompt="hi"))
+    second = list(client.complete_stream(system_prompt="SYS", user_prompt="hi"))
+    assert first == "hi-1"
+    assert second == ["hi-1"]
+    assert inner.calls == 1
+
+
+def test_does_not_store_rejected_responses(tmp_path: Path) -> None:
+    def _reject_first(response: str) -> None:
+        if response.endswith("-1"):
+            raise ValueError("malformed")
+
+    inner = _CountingClient()
+    client = CachingLanguageModelClient(
+        inner, model="gpt-test", path=tmp_path / "llm.sqlite", validate=_reject_first
+    )
+    assert client.complete(system_prompt="SYS", user_prompt="hi") == "hi-1"
+    assert client.complete(system_prompt="SYS", user_prompt="hi") == "hi-2"
+    assert client.complete(system_prompt="SYS", user_prompt="hi") == "hi-2"
+    assert inner.calls == 2
+
+
+def test_keys_include_base_url(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite"
+    CachingLanguageModelClient(
+        _CountingClient(), model="gpt-test", base_url="https://a.example/v1", path=path
+    ).complete(system_prompt="SYS", user_prompt="hi")
+    inner = _CountingClient()
+    client = CachingLanguageModelClient(
+        inner, model="gpt-test", base_url="https://b.example/v1", path=path
+    )
+    client.complete(system_prompt="SYS", user_prompt="hi")
+    assert inner.calls == 1
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from terminal_ai.io.prompt_loader import load_prompt
+
+
+def test_load_prompt_from_env_directory(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    (tmp_path / "custom.txt").write_text("Shell: {shell}", encoding="utf-8")
+    monkeypatch.setenv("TERMINAL_AI_PROMPTS_DIR", str(tmp_path))
+    assert load_prompt("custom.txt") == "Shell: {shell}"
+
+
+def test_load_prompt_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError, match="missing.txt"):
+        load_prompt("missing.txt", directory=tmp_path)
+
+
+def test_load_prompt_default_directory(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TERMINAL_AI_PROMPTS_DIR", raising=False)
+    assert "{shell}" in load_prompt("command_synthesis.txt")